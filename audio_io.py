@@ -0,0 +1,62 @@
+"""Shared audio conversion/decoding helpers for the transcription scripts.
+
+Two paths in, one of two forms out:
+
+- ``decode_to_array``: PyAV in-process decode to a 16 kHz mono float32 array,
+  for callers that feed faster-whisper directly (no ffmpeg fork, no temp wav).
+- ``convert_m4a_to_wav``: ffmpeg to an on-disk wav, for callers that need a
+  file (the diarization pipeline). Skipped when the wav is already newer
+  than the source, so repeat runs cost nothing.
+"""
+
+import subprocess
+from pathlib import Path
+
+import av
+import numpy as np
+
+SAMPLE_RATE = 16000  # Whisper's expected input rate
+
+
+def needs_update(source: Path, target: Path) -> bool:
+    if not source.exists():
+        return False
+    if not target.exists():
+        return True
+    return target.stat().st_mtime < source.stat().st_mtime
+
+
+def convert_m4a_to_wav(m4a_path: Path, wav_path: Path) -> Path:
+    if not needs_update(m4a_path, wav_path):
+        return wav_path
+
+    command = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        str(m4a_path),
+        "-ar",
+        str(SAMPLE_RATE),
+        "-ac",
+        "1",
+        str(wav_path),
+    ]
+    subprocess.run(command, check=True)
+    print(f"✔ Converted: {m4a_path.name} → {wav_path.name}")
+    return wav_path
+
+
+def decode_to_array(src: Path, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode + resample to mono float32 at ``sr`` in-process."""
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=sr)
+    chunks = []
+    with av.open(str(src)) as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+    # Flush samples still buffered in the rate converter at EOF
+    for resampled in resampler.resample(None):
+        chunks.append(resampled.to_ndarray().reshape(-1))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32, copy=False)
@@ -0,0 +1,68 @@
+"""mlx-whisper backend for Apple Silicon (ANE / Metal).
+
+On Apple Silicon the compute-bound encoder runs considerably faster through
+the Neural Engine than through CTranslate2's MPS path (same motivation as
+whisper.cpp's CoreML backend). mlx-whisper gets that scheduling via the MLX
+graph with no model conversion step. ``load_model()`` tries this ahead of
+the MPS attempt and falls through on ImportError everywhere mlx is not
+installed (i.e. any non-Apple host).
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from trt_whisper import Segment, TranscriptionInfo
+
+
+def _mlx_repo(model_size: str) -> str:
+    """Map a Whisper size or HF model id to its mlx-community conversion.
+
+    The published conversions are inconsistently named: plain sizes carry an
+    ``-mlx`` suffix, large-v3-turbo does not, and the distil models are
+    published as ``distil-whisper-*``."""
+    name = model_size.split("/")[-1]
+    if name.startswith("distil-"):
+        return f"mlx-community/distil-whisper-{name[len('distil-'):]}"
+    if name == "large-v3-turbo":
+        return "mlx-community/whisper-large-v3-turbo"
+    return f"mlx-community/whisper-{name}-mlx"
+
+
+class MLXWhisperModel:
+    """Mirrors ``WhisperModel.transcribe`` on top of ``mlx_whisper.transcribe``."""
+
+    def __init__(self, model_size: str):
+        import mlx_whisper  # ImportError on non-Apple hosts → next attempt
+
+        self._transcribe = mlx_whisper.transcribe
+        self._repo = _mlx_repo(model_size)
+        # Resolve the repo and load the weights now: a bad repo or download
+        # failure must raise here, inside load_model()'s attempt loop, so it
+        # can fall through to MPS/CPU instead of failing per file later.
+        self._transcribe(
+            np.zeros(1600, dtype=np.float32),  # 0.1 s of silence
+            path_or_hf_repo=self._repo,
+        )
+
+    def transcribe(
+        self,
+        audio,
+        language: Optional[str] = None,
+        temperature: float = 0.0,
+        condition_on_previous_text: bool = False,
+        **_: object,
+    ) -> Tuple[Iterable[Segment], TranscriptionInfo]:
+        result = self._transcribe(
+            audio,  # mlx-whisper accepts a path or a float32 array
+            path_or_hf_repo=self._repo,
+            language=language,
+            temperature=temperature,
+            condition_on_previous_text=condition_on_previous_text,
+        )
+        segments: List[Segment] = [
+            Segment(start=s["start"], end=s["end"], text=s["text"])
+            for s in result.get("segments", [])
+        ]
+        info = TranscriptionInfo(language=result.get("language") or language or "en")
+        return segments, info